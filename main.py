@@ -22,6 +22,7 @@ from flask_restx import Api
 from version import __version__
 from adapters.http.execute import bp as execute_bp
 from adapters.http.docs import execute_ns
+from adapters.http.health import bp as health_bp, warmup
 
 app = Flask(__name__)
 app.config.update(flask_config)
@@ -40,6 +41,7 @@ api = Api(
 
 api.add_namespace(execute_ns,     path=f'{api_prefix}/execute')
 app.register_blueprint(execute_bp, url_prefix=api_prefix)
+app.register_blueprint(health_bp, url_prefix=f'{api_prefix}/health')
 
 result_logger.info("API namespaces and blueprints registered")
 
@@ -62,8 +64,57 @@ def version():
     request_logger.info("GET /version")
     return jsonify(version=__version__), 200
 
+def run_prefork(server_config, host, port):
+    """Serve the preloaded app from several workers sharing the port."""
+    from adapters.executor.autoscaler import SharedSlots
+    from adapters.http.prefork_server import PreforkServer
+    from adapters.http.execute import executor
+    from usecases.warmup import SharedReadiness
+
+    workers = int(server_config["workers"])
+    max_processes = workers * 2 + 1
+    # Import the allowed modules once so workers share them copy-on-write
+    try:
+        request_logger.info(f"Preloaded allowed modules in {warmup.preload():.1f}ms")
+    except ImportError as e:
+        error_logger.error(f"Preloading allowed modules failed: {e}")
+
+    # Created before forking so every worker shares the same state; health
+    # checks report ready only once all workers are warm
+    readiness = SharedReadiness(workers, max_processes=max_processes)
+    warmup.shared = readiness
+    exit_hooks = [readiness.clear]
+    global_max = server_config.get("global_max_concurrency")
+    if global_max:
+        # The master hands back the slots of workers that die
+        slots = SharedSlots(int(global_max), max_processes=max_processes)
+        executor.limiter.global_slots = slots
+        exit_hooks.append(slots.reclaim)
+
+    def on_worker_exit(pid):
+        for hook in exit_hooks:
+            hook(pid)
+
+    PreforkServer(
+        app, host, port,
+        workers=workers,
+        graceful_timeout=float(server_config.get("graceful_timeout", 30)),
+        # Each worker runs the canaries in the background once it is serving,
+        # so /health/live answers while /health/ready still reports 503
+        post_fork=warmup.start,
+        on_worker_exit=on_worker_exit
+    ).serve()
+
 if __name__ == '__main__':
-    request_logger.info("Starting Flask app on 0.0.0.0:8080")
-    app.run(host=flask_config.get("host", "0.0.0.0"),
-            port=flask_config.get("port", 8080),
-            debug=flask_config.get("debug", False))
\ No newline at end of file
+    host = flask_config.get("host", "0.0.0.0")
+    port = flask_config.get("port", 8080)
+    server_config = config_loader.get_server_config()
+    if int(server_config.get("workers", 1)) > 1:
+        request_logger.info(f"Starting prefork server on {host}:{port}")
+        run_prefork(server_config, host, port)
+    else:
+        request_logger.info(f"Starting Flask app on {host}:{port}")
+        warmup.start()
+        app.run(host=host,
+                port=port,
+                debug=flask_config.get("debug", False))
\ No newline at end of file
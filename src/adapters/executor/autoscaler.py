@@ -0,0 +1,340 @@
+"""
+Adaptive concurrency control for sandbox launches.
+
+The limiter starts at its full capacity. It shrinks the number of
+concurrent nsjail processes only after several consecutive evaluations
+with the host under CPU or memory pressure, and grows it again quickly
+once the pressure is gone and requests queue for longer than the target
+wait. Idle periods never lower the limit: there is no warm pool, so a
+lower cap would save nothing and only make the next burst queue. Every
+decision is kept so it can be inspected for tuning.
+"""
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from domain.exceptions import ExecutionQueueFullError
+
+request_logger = logging.getLogger("request_logger")
+cloud_logger = logging.getLogger("cloud_logger")
+
+
+class HostPressureReader:
+    """
+    Reads CPU and memory pressure (0-100) from /proc.
+    Uses PSI ``some avg10`` when available, otherwise load average per CPU
+    and the share of memory not available.
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self.proc_root = Path(proc_root)
+
+    def read(self) -> dict:
+        return {"cpu": self._cpu_pressure(), "memory": self._memory_pressure()}
+
+    def _psi_avg10(self, resource: str):
+        try:
+            lines = (self.proc_root / "pressure" / resource).read_text().splitlines()
+        except OSError:
+            return None
+        for line in lines:
+            if line.startswith("some"):
+                fields = dict(item.split("=") for item in line.split()[1:])
+                return float(fields["avg10"])
+        return None
+
+    def _cpu_pressure(self) -> float:
+        psi = self._psi_avg10("cpu")
+        if psi is not None:
+            return psi
+        try:
+            load_1m = float((self.proc_root / "loadavg").read_text().split()[0])
+        except (OSError, ValueError, IndexError):
+            return 0.0
+        return min(100.0, load_1m / (os.cpu_count() or 1) * 100)
+
+    def _memory_pressure(self) -> float:
+        psi = self._psi_avg10("memory")
+        if psi is not None:
+            return psi
+        try:
+            meminfo = {}
+            for line in (self.proc_root / "meminfo").read_text().splitlines():
+                key, value = line.split(":", 1)
+                meminfo[key] = int(value.split()[0])
+            return (1 - meminfo["MemAvailable"] / meminfo["MemTotal"]) * 100
+        except (OSError, ValueError, KeyError, ZeroDivisionError):
+            return 0.0
+
+
+class SharedSlots:
+    """
+    Cap on concurrent executions shared by prefork workers.
+
+    Slots held by each process are counted per pid in shared memory, so when
+    a worker dies the master can hand its slots back with ``reclaim``. A
+    plain semaphore would lose them for good.
+    Waiters poll under a plain lock instead of sleeping on a shared
+    condition: a ``multiprocessing.Condition`` counts its sleepers, and one
+    killed while waiting makes the next ``notify_all`` block forever.
+    Must be created in the master before the workers are forked.
+    """
+
+    def __init__(self, capacity: int, max_processes: int = 64, context=None,
+                 poll_interval: float = 0.01):
+        if capacity < 1:
+            raise ValueError("Shared slot capacity must be at least 1")
+        context = context or multiprocessing.get_context("fork")
+        self.capacity = capacity
+        self.poll_interval = poll_interval
+        self._lock = context.Lock()
+        self._pids = context.Array("i", max_processes, lock=False)
+        self._held = context.Array("i", max_processes, lock=False)
+        self._row_owner = None
+        self._row = None
+
+    def acquire(self, timeout: float = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                row = self._own_row()
+                if sum(self._held) < self.capacity:
+                    self._held[row] += 1
+                    return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(self.poll_interval if remaining is None else min(self.poll_interval, remaining))
+
+    def release(self):
+        with self._lock:
+            row = self._own_row()
+            if self._held[row] > 0:
+                self._held[row] -= 1
+
+    def reclaim(self, pid: int) -> int:
+        """Free every slot held by ``pid``; returns how many were freed."""
+        with self._lock:
+            for row, owner in enumerate(self._pids):
+                if owner == pid:
+                    freed = self._held[row]
+                    self._pids[row] = 0
+                    self._held[row] = 0
+                    return freed
+        return 0
+
+    def in_use(self) -> int:
+        with self._lock:
+            return sum(self._held)
+
+    def _own_row(self) -> int:
+        # Caller must hold self._lock
+        pid = os.getpid()
+        if self._row_owner == pid and self._pids[self._row] == pid:
+            return self._row
+        for row, owner in enumerate(self._pids):
+            if owner in (0, pid):
+                self._pids[row] = pid
+                self._row_owner, self._row = pid, row
+                return row
+        raise RuntimeError("No free shared slot rows; raise max_processes")
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Bounds concurrent sandbox executions between ``min_concurrency`` and
+    ``max_concurrency``, adjusting the limit from queue wait and host load.
+    """
+
+    def __init__(
+        self,
+        min_concurrency: int = 1,
+        max_concurrency: int = 8,
+        initial_concurrency: int = None,
+        target_queue_wait_ms: float = 200,
+        evaluation_interval: float = 1.0,
+        scale_up_step: int = 2,
+        scale_down_step: int = 1,
+        scale_down_after: int = 5,
+        cpu_pressure_limit: float = 80,
+        memory_pressure_limit: float = 80,
+        max_queue_wait: float = 30,
+        history_size: int = 50,
+        pressure_reader: HostPressureReader = None,
+        global_slots=None,
+        clock=time.monotonic
+    ):
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError("Autoscaling bounds must satisfy 1 <= min_concurrency <= max_concurrency")
+
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.limit = min(max(initial_concurrency or max_concurrency, min_concurrency), max_concurrency)
+        self.target_queue_wait = target_queue_wait_ms / 1000
+        self.evaluation_interval = evaluation_interval
+        self.scale_up_step = scale_up_step
+        self.scale_down_step = scale_down_step
+        self.scale_down_after = scale_down_after
+        self.cpu_pressure_limit = cpu_pressure_limit
+        self.memory_pressure_limit = memory_pressure_limit
+        self.max_queue_wait = max_queue_wait
+        self.pressure_reader = pressure_reader or HostPressureReader()
+        # Optional SharedSlots cap shared by prefork workers
+        self.global_slots = global_slots
+        self.clock = clock
+
+        self.active = 0
+        self.waiting = 0
+        self.decisions = deque(maxlen=history_size)
+        self._condition = threading.Condition()
+        self._waits = []
+        self._queued_since = []
+        self._peak_active = 0
+        self._pressured_evaluations = 0
+        self._last_evaluation = clock()
+
+    @classmethod
+    def from_config(cls, config: dict) -> "AdaptiveConcurrencyLimiter":
+        """Build a limiter from the ``nsjail.autoscaling`` config section."""
+        keys = (
+            "min_concurrency", "max_concurrency", "initial_concurrency",
+            "target_queue_wait_ms", "evaluation_interval", "scale_up_step",
+            "scale_down_step", "scale_down_after", "cpu_pressure_limit",
+            "memory_pressure_limit", "max_queue_wait", "history_size"
+        )
+        return cls(**{key: config[key] for key in keys if config.get(key) is not None})
+
+    @contextmanager
+    def slot(self):
+        """Hold one execution slot for the duration of the block."""
+        deadline = self.acquire()
+        try:
+            if self.global_slots is None:
+                yield
+                return
+            # The shared cap only gets what is left of the queue wait budget
+            remaining = max(0.0, deadline - self.clock())
+            if not self.global_slots.acquire(timeout=remaining):
+                raise self._queue_full()
+            try:
+                yield
+            finally:
+                self.global_slots.release()
+        finally:
+            self.release()
+
+    def acquire(self) -> float:
+        """
+        Take a local slot; returns the deadline (on ``clock``) by which the
+        whole queue wait, including the shared cap, must end.
+        """
+        with self._condition:
+            started = self.clock()
+            deadline = started + self.max_queue_wait
+            self.waiting += 1
+            self._queued_since.append(started)
+            try:
+                while self.active >= self.limit:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        raise self._queue_full()
+                    self._condition.wait(timeout=min(remaining, self.evaluation_interval))
+                    self._maybe_evaluate()
+            finally:
+                self.waiting -= 1
+                self._queued_since.remove(started)
+            self.active += 1
+            self._peak_active = max(self._peak_active, self.active)
+            self._waits.append(self.clock() - started)
+            self._maybe_evaluate()
+            return deadline
+
+    def release(self):
+        with self._condition:
+            self.active -= 1
+            self._maybe_evaluate()
+            self._condition.notify()
+
+    def snapshot(self) -> dict:
+        """Current state, bounds and recent scaling decisions."""
+        with self._condition:
+            return {
+                "limit": self.limit,
+                "active": self.active,
+                "waiting": self.waiting,
+                "min_concurrency": self.min_concurrency,
+                "max_concurrency": self.max_concurrency,
+                "target_queue_wait_ms": self.target_queue_wait * 1000,
+                "decisions": list(self.decisions)
+            }
+
+    def _queue_full(self) -> ExecutionQueueFullError:
+        return ExecutionQueueFullError(
+            "Execution queue is full. Please retry later.",
+            retry_after=max(1, math.ceil(self.evaluation_interval))
+        )
+
+    def _maybe_evaluate(self):
+        # Caller must hold self._condition
+        now = self.clock()
+        if now - self._last_evaluation < self.evaluation_interval:
+            return
+        self._last_evaluation = now
+        self._evaluate()
+
+    def _evaluate(self):
+        pressure = self.pressure_reader.read()
+        waits, self._waits = self._waits, []
+        peak_active, self._peak_active = self._peak_active, self.active
+        avg_wait = sum(waits) / len(waits) if waits else 0.0
+        # Requests still queued count with how long they have waited so far
+        oldest_wait = self.clock() - min(self._queued_since) if self._queued_since else 0.0
+        overloaded = (
+            pressure["cpu"] >= self.cpu_pressure_limit
+            or pressure["memory"] >= self.memory_pressure_limit
+        )
+        previous = self.limit
+
+        if overloaded:
+            # Only sustained host pressure lowers the limit
+            action = "hold_pressure"
+            self._pressured_evaluations += 1
+            if self._pressured_evaluations >= self.scale_down_after:
+                action = "scale_down"
+                self._pressured_evaluations = 0
+                self.limit = max(self.min_concurrency, self.limit - self.scale_down_step)
+        elif max(avg_wait, oldest_wait) > self.target_queue_wait:
+            # Scale up as soon as queueing exceeds the target
+            action = "scale_up"
+            self._pressured_evaluations = 0
+            self.limit = min(self.max_concurrency, self.limit + self.scale_up_step)
+        else:
+            action = "hold"
+            self._pressured_evaluations = 0
+
+        decision = {
+            "timestamp": time.time(),
+            "action": action,
+            "previous_limit": previous,
+            "limit": self.limit,
+            "avg_queue_wait_ms": round(avg_wait * 1000, 3),
+            "oldest_queue_wait_ms": round(oldest_wait * 1000, 3),
+            "samples": len(waits),
+            "active": self.active,
+            "peak_active": peak_active,
+            "waiting": self.waiting,
+            "cpu_pressure": pressure["cpu"],
+            "memory_pressure": pressure["memory"]
+        }
+        self.decisions.append(decision)
+        if self.limit != previous:
+            request_logger.info(f"Sandbox concurrency {previous} -> {self.limit}: {decision}")
+            cloud_logger.info(f"Sandbox concurrency {previous} -> {self.limit}: {decision}")
+            self._condition.notify_all()
+        return decision
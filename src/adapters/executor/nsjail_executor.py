@@ -1,10 +1,13 @@
 import subprocess
 import logging
 import tempfile
-import json
 from pathlib import Path
 
 from src.utils.config_loader import AppConfigLoader
+from adapters.executor.autoscaler import AdaptiveConcurrencyLimiter
+from adapters.serializer.json_serializer import get_serializer, result_writer_source
+from domain.exceptions import ExecutionQueueFullError
+from domain.models import RawExecutionResult
 from interfaces.schemas import ExecutionResponseSchema, ExecutionResponseError
 
 
@@ -12,12 +15,18 @@ class NsjailExecutor:
     def __init__(self):
         self.logger = logging.getLogger("request_logger")
         self.cloud_logger = logging.getLogger("cloud_logger")
-        self.config = AppConfigLoader().get_nsjail_config()
+        config_loader = AppConfigLoader()
+        self.config = config_loader.get_nsjail_config()
+        serialization = config_loader.get_serialization_config()
 
         self.binary_path = self._require_config("binary_path")
         self.config_path = self._require_config("config_path")
         self.python_path = self._require_config("python_path")
         self.timeout = int(self.config.get("timeout", 10))
+        self.serializer = get_serializer(serialization.get("backend"))
+        self.validate_result = bool(serialization.get("validate_result", False))
+        self.result_writer = result_writer_source(self.serializer.name)
+        self.limiter = AdaptiveConcurrencyLimiter.from_config(self.config.get("autoscaling") or {})
 
     def _require_config(self, key: str) -> str:
         value = self.config.get(key)
@@ -28,13 +37,12 @@ class NsjailExecutor:
     def _wrap_script(self, user_script: str, result_path: str) -> str:
         return f"""{user_script}
 
+{self.result_writer}
 if __name__ == "__main__":
     try:
         result = main()
         if isinstance(result, dict):
-            import json
-            with open("{result_path}", "w") as f:
-                json.dump(result, f)
+            _write_result(result, "{result_path}")
         else:
             raise ValueError("Function 'main' must return a dictionary (JSON serializable)")
     except Exception as e:
@@ -60,16 +68,34 @@ if __name__ == "__main__":
             self.logger.debug(f"Running NSJail command: {' '.join(command)}")
             self.cloud_logger.debug(f"Running NSJail command: {' '.join(command)}")
 
-            process = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout
-            )
+            with self.limiter.slot():
+                process = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.timeout
+                )
 
             if process.returncode == 0 and result_path.exists():
-                with open(result_path) as f:
-                    result_data = json.load(f)
+                # The result file is written by untrusted code: only a single
+                # well-formed JSON object may be passed on
+                result_json = result_path.read_bytes()
+                try:
+                    result_data = self.serializer.loads(result_json)
+                except ValueError:
+                    result_data = None
+                if not isinstance(result_data, dict):
+                    self.logger.error("Sandbox wrote a malformed result file")
+                    self.cloud_logger.error("Sandbox wrote a malformed result file")
+                    return ExecutionResponseError(
+                        error="Unable to execute the submitted command. Please verify the structure and content of the script."
+                    )
+
+                if not self.validate_result:
+                    return RawExecutionResult(
+                        result_json=result_json,
+                        stdout=process.stdout
+                    )
 
                 return ExecutionResponseSchema(
                     result=result_data,
@@ -86,6 +112,10 @@ if __name__ == "__main__":
                     error="Unable to execute the submitted command. Please verify the structure and content of the script."
                     )
 
+        except ExecutionQueueFullError:
+            # Overload is not a script error; let the HTTP layer answer 503
+            raise
+
         except Exception as e:
             self.logger.exception("NSJail execution error")
             self.cloud_logger.exception("NSJail execution error")
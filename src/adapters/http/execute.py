@@ -1,9 +1,10 @@
 import logging
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 
 from adapters.executor.nsjail_executor import NsjailExecutor
 from adapters.validator.import_validator import ImportValidator
-from domain.exceptions import ExecutionError
+from domain.exceptions import ExecutionError, ExecutionQueueFullError
+from domain.models import RawExecutionResult
 from interfaces.schemas import (
     ScriptRequestSchema,
     ExecutionResponseSchema,
@@ -11,6 +12,7 @@ from interfaces.schemas import (
 )
 
 executor = NsjailExecutor()
+serializer = executor.serializer
 bp = Blueprint("execute", __name__)
 
 # Loggers
@@ -19,6 +21,11 @@ result_logger = logging.getLogger("result_logger")
 error_logger = logging.getLogger("error_logger")
 cloud_logger = logging.getLogger("cloud_logger")
 
+
+def _json_response(body: bytes, status: int) -> Response:
+    return Response(body, status=status, mimetype="application/json")
+
+
 @bp.route("/execute", methods=["POST"])
 def execute_script():
     payload = request.get_json() or {}
@@ -40,7 +47,20 @@ def execute_script():
         if hasattr(result, "error") and result.error:
             return jsonify(error=result.error), 400
 
-        return jsonify(result=result.result, stdout=result.stdout), 200
+        if isinstance(result, RawExecutionResult):
+            # The executor checked this is one well-formed JSON object; splice it in as-is
+            # instead of re-encoding it
+            body = b'{"result":' + result.result_json + b',"stdout":' + serializer.dumps(result.stdout) + b'}'
+            return _json_response(body, 200)
+
+        return _json_response(serializer.dumps({"result": result.result, "stdout": result.stdout}), 200)
+
+    except ExecutionQueueFullError as ex:
+        error_logger.error("Execution queue full")
+        cloud_logger.error("Execution queue full")
+        response = jsonify(error=str(ex))
+        response.headers["Retry-After"] = str(ex.retry_after)
+        return response, 503
 
     except ExecutionError as ex:
         error_logger.error("Execution error", exc_info=True)
@@ -56,3 +76,9 @@ def execute_script():
         error_logger.exception("Unexpected error during execution")
         cloud_logger.exception("Unexpected error during execution")
         return jsonify({"error": "Unexpected error occurred"}), 500
+
+
+@bp.route("/execute/scaling", methods=["GET"])
+def scaling_status():
+    """Return the sandbox concurrency limit and recent scaling decisions."""
+    return jsonify(executor.limiter.snapshot()), 200
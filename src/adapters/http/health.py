@@ -0,0 +1,32 @@
+import logging
+from flask import Blueprint, jsonify
+
+from src.utils.config_loader import AppConfigLoader
+from adapters.http.execute import executor
+from adapters.validator.import_validator import ImportValidator
+from usecases.warmup import WarmupUseCase
+
+config_loader = AppConfigLoader()
+warmup = WarmupUseCase(
+    executor=executor,
+    validator=ImportValidator(),
+    logger=logging.getLogger("cloud_logger"),
+    allowed_modules=config_loader.get_allowed_commands(),
+    config=config_loader.get_warmup_config()
+)
+bp = Blueprint("health", __name__)
+
+
+@bp.route("/live", methods=["GET"])
+def live():
+    """The process is serving; fails once warm-up has failed too many times."""
+    if not warmup.snapshot()["live"]:
+        return jsonify(status="unhealthy"), 503
+    return jsonify(status="alive"), 200
+
+
+@bp.route("/ready", methods=["GET"])
+def ready():
+    """Ready only once warm-up has succeeded; includes measured latencies."""
+    status = warmup.snapshot()
+    return jsonify(status), 200 if status["ready"] else 503
@@ -0,0 +1,249 @@
+"""
+Prefork launcher: N worker processes serve one port.
+
+The master binds a single listening socket (with SO_REUSEPORT, so another
+launcher can bind the port during a handover) and every worker inherits
+it, so connections waiting in its accept queue survive any one worker
+stopping. The application is imported once in the master before forking,
+so workers share its memory copy-on-write. Signals handled by the master:
+
+- SIGTERM / SIGINT: stop all workers gracefully and exit.
+- SIGHUP: recycle the workers one at a time. Replacements are forked from
+  the master, so this does not load new code or configuration; restart
+  the master for that.
+"""
+import logging
+import os
+import select
+import signal
+import socket
+import threading
+import time
+
+from werkzeug.serving import make_server
+
+request_logger = logging.getLogger("request_logger")
+error_logger = logging.getLogger("error_logger")
+cloud_logger = logging.getLogger("cloud_logger")
+
+
+def create_reuseport_socket(host: str, port: int, backlog: int = 128) -> socket.socket:
+    """
+    Create a listening TCP socket with SO_REUSEPORT so the address can be
+    bound again by another process while this one is still serving.
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("SO_REUSEPORT is not supported on this platform")
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+class PreforkServer:
+    """
+    Forks and supervises the API workers. Workers that exit unexpectedly
+    are replaced; replacements that fail to start back off exponentially.
+    """
+
+    def __init__(self, app, host: str, port: int, workers: int = 2,
+                 graceful_timeout: float = 30, ready_timeout: float = 10,
+                 min_uptime: float = 5, backoff: float = 0.5, max_backoff: float = 30,
+                 post_fork=None, on_worker_exit=None):
+        if workers < 1:
+            raise ValueError("Prefork server needs at least one worker")
+        self.app = app
+        self.host = host
+        self.port = port
+        self.worker_count = workers
+        self.graceful_timeout = graceful_timeout
+        self.ready_timeout = ready_timeout
+        self.min_uptime = min_uptime
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        # Called in each worker once it is accepting connections
+        self.post_fork = post_fork
+        # Called in the master with the pid of every worker that exits
+        self.on_worker_exit = on_worker_exit
+        self.listener = None
+        self.workers = {}  # pid -> monotonic start time
+        self._stopping = False
+        self._reload_requested = False
+        self._spawn_failures = 0
+        self._next_spawn_at = 0.0
+
+    def serve(self):
+        self.listener = create_reuseport_socket(self.host, self.port)
+        # Non-blocking so an idle worker never sits in accept() when another
+        # worker took the connection; that would delay its shutdown
+        self.listener.setblocking(False)
+        self.port = self.listener.getsockname()[1]
+
+        previous_handlers = {
+            signum: signal.signal(signum, handler)
+            for signum, handler in (
+                (signal.SIGTERM, self._handle_stop),
+                (signal.SIGINT, self._handle_stop),
+                (signal.SIGHUP, self._handle_reload),
+            )
+        }
+        try:
+            request_logger.info(f"Starting {self.worker_count} workers on {self.host}:{self.port}")
+            cloud_logger.info(f"Starting {self.worker_count} workers on {self.host}:{self.port}")
+            for _ in range(self.worker_count):
+                if self._spawn_worker() is None:
+                    raise RuntimeError("Workers failed to start; aborting")
+
+            while not self._stopping:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self._rolling_restart()
+                self._reap_workers()
+                self._maintain_workers()
+                time.sleep(0.5)
+        finally:
+            self._stop_workers(list(self.workers))
+            self.listener.close()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def _handle_stop(self, signum, frame):
+        self._stopping = True
+
+    def _handle_reload(self, signum, frame):
+        self._reload_requested = True
+
+    def _spawn_worker(self):
+        """Fork a worker and wait until it serves; returns its pid or None."""
+        ready_read, ready_write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_read)
+            exit_code = 0
+            try:
+                self._run_worker(ready_write)
+            except BaseException:
+                error_logger.exception("Worker crashed")
+                exit_code = 1
+            finally:
+                os._exit(exit_code)
+
+        os.close(ready_write)
+        try:
+            ready, _, _ = select.select([ready_read], [], [], self.ready_timeout)
+            started = bool(ready) and os.read(ready_read, 1) == b"1"
+        finally:
+            os.close(ready_read)
+
+        if not started:
+            error_logger.error(f"Worker {pid} did not become ready")
+            self._signal(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            self._worker_exited(pid)
+            self._record_failure()
+            return None
+
+        self.workers[pid] = time.monotonic()
+        request_logger.info(f"Worker {pid} started")
+        return pid
+
+    def _run_worker(self, ready_fd: int):
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        server = make_server(self.host, self.port, self.app, threaded=True, fd=self.listener.fileno())
+        # Join in-flight request threads on close so shutdown drains them
+        server.daemon_threads = False
+
+        def shutdown(signum, frame):
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        os.write(ready_fd, b"1")
+        os.close(ready_fd)
+        if self.post_fork is not None:
+            self.post_fork()
+        try:
+            server.serve_forever()
+        finally:
+            # Closes only this worker's copy of the shared listening socket
+            server.server_close()
+
+    def _maintain_workers(self):
+        """Replace missing workers, honouring the spawn backoff."""
+        now = time.monotonic()
+        if (self._spawn_failures and len(self.workers) == self.worker_count
+                and all(now - started >= self.min_uptime for started in self.workers.values())):
+            self._spawn_failures = 0
+        while len(self.workers) < self.worker_count and not self._stopping:
+            if time.monotonic() < self._next_spawn_at:
+                return
+            if self._spawn_worker() is None:
+                return
+
+    def _record_failure(self):
+        self._spawn_failures += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (self._spawn_failures - 1))
+        self._next_spawn_at = time.monotonic() + delay
+        error_logger.error(f"Worker failure #{self._spawn_failures}; next spawn in {delay:.1f}s")
+
+    def _rolling_restart(self):
+        request_logger.info("Recycling workers")
+        cloud_logger.info("Recycling workers")
+        for pid in list(self.workers):
+            if self._stopping:
+                return
+            # Start the replacement first so the port never loses capacity
+            if self._spawn_worker() is None:
+                error_logger.error("Replacement worker failed to start; keeping the remaining workers")
+                return
+            self._stop_workers([pid])
+
+    def _stop_workers(self, pids):
+        for pid in pids:
+            self._signal(pid, signal.SIGTERM)
+        deadline = time.monotonic() + self.graceful_timeout
+        while time.monotonic() < deadline and any(pid in self.workers for pid in pids):
+            self._reap_workers(expected=pids)
+            time.sleep(0.1)
+        for pid in pids:
+            if pid in self.workers:
+                error_logger.error(f"Worker {pid} did not stop in time; killing it")
+                self._signal(pid, signal.SIGKILL)
+                os.waitpid(pid, 0)
+                del self.workers[pid]
+                self._worker_exited(pid)
+
+    def _reap_workers(self, expected=()):
+        """Collect exited workers; early unexpected exits count as failures."""
+        for pid in list(self.workers):
+            try:
+                reaped, status = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                reaped, status = pid, 0
+            if reaped == 0:
+                continue
+            started = self.workers.pop(pid)
+            self._worker_exited(pid)
+            exit_code = os.waitstatus_to_exitcode(status)
+            if pid in expected or self._stopping:
+                request_logger.info(f"Worker {pid} exited with code {exit_code}")
+                continue
+            error_logger.error(f"Worker {pid} exited with code {exit_code}; replacing it")
+            if time.monotonic() - started < self.min_uptime:
+                self._record_failure()
+
+    def _worker_exited(self, pid: int):
+        if self.on_worker_exit is not None:
+            self.on_worker_exit(pid)
+
+    @staticmethod
+    def _signal(pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,207 @@
+"""
+Pluggable JSON serializers shared by the sandbox wrapper and the HTTP layer.
+
+Both backends encode numpy arrays/scalars, pandas objects, datetimes,
+timedeltas, decimals and sets through the same ``to_builtin`` hook, emit
+``null`` for NaN/Infinity/NaT/NA and normalise non-string dict keys, so a
+payload serializes to the same bytes whichever backend is available.
+"""
+import inspect
+import json
+import logging
+import textwrap
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+error_logger = logging.getLogger("error_logger")
+
+
+def scrub_non_finite(value):
+    """
+    Recursively replace NaN/Infinity floats with None, turn tuples into
+    lists and normalise dict keys to strings.
+    Self-contained so its source can be embedded in the sandbox wrapper.
+    """
+    import datetime
+    import math
+
+    def normalise_key(key):
+        if isinstance(key, str):
+            return key
+        if key is None:
+            return "null"
+        if isinstance(key, bool):
+            return "true" if key else "false"
+        if isinstance(key, (datetime.date, datetime.time)):
+            return key.isoformat()
+        return str(key)
+
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {normalise_key(k): scrub_non_finite(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [scrub_non_finite(v) for v in value]
+    return value
+
+
+def to_builtin(obj):
+    """
+    Encoder hook for values outside the JSON core types; both backends
+    route numpy values through it so they produce identical output.
+    numpy and pandas are only looked up if the script already imported them.
+    Self-contained so its source can be embedded in the sandbox wrapper.
+    """
+    import sys
+    import dataclasses
+    import datetime
+    import decimal
+    import enum
+    import uuid
+
+    np = sys.modules.get("numpy")
+    pd = sys.modules.get("pandas")
+
+    if pd is not None:
+        if isinstance(obj, pd.DataFrame):
+            return scrub_non_finite(obj.to_dict(orient="records"))
+        if isinstance(obj, pd.Series):
+            return scrub_non_finite(obj.to_dict())
+        if isinstance(obj, pd.Index):
+            return scrub_non_finite(obj.tolist())
+        if obj is pd.NaT or obj is getattr(pd, "NA", None):
+            return None
+    if np is not None:
+        if isinstance(obj, np.ndarray):
+            if obj.dtype.kind in "mM":
+                # tolist() turns datetime64[ns]/timedelta64[ns] into raw integers
+                return [to_builtin(item) for item in obj]
+            return scrub_non_finite(obj.tolist())
+        if isinstance(obj, np.datetime64):
+            if np.isnat(obj):
+                return None
+            return to_builtin(obj.astype("datetime64[us]").item())
+        if isinstance(obj, np.timedelta64):
+            if np.isnat(obj):
+                return None
+            return to_builtin(obj.astype("timedelta64[us]").item())
+        if isinstance(obj, np.generic):
+            return scrub_non_finite(obj.item())
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, datetime.timedelta):
+        return obj.total_seconds()
+    if isinstance(obj, decimal.Decimal):
+        return scrub_non_finite(float(obj))
+    if isinstance(obj, (set, frozenset)):
+        return scrub_non_finite(list(obj))
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return scrub_non_finite(obj.value)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return scrub_non_finite(dataclasses.asdict(obj))
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"Invalid JSON constant: {name}")
+
+
+class JsonSerializer:
+    """
+    Serializer backed by the standard library ``json`` module.
+    """
+    name = "json"
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(
+            scrub_non_finite(obj),
+            default=to_builtin,
+            allow_nan=False,
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        # Strict like orjson: only UTF-8 without a BOM, no NaN/Infinity.
+        # json.loads(bytes) would also accept UTF-16/32 and a UTF-8 BOM
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            data = bytes(data).decode("utf-8")
+        return json.loads(data, parse_constant=_reject_constant)
+
+
+class OrjsonSerializer(JsonSerializer):
+    """
+    Serializer backed by ``orjson``. Payloads orjson rejects (non-string
+    keys, integers over 64 bits) are retried on the standard library path,
+    so the output matches the json backend.
+    """
+    name = "orjson"
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, default=to_builtin)
+        except orjson.JSONEncodeError:
+            return super().dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+}
+
+
+def get_serializer(backend: str = None) -> JsonSerializer:
+    """
+    Return the serializer for the configured backend, defaulting to orjson
+    and falling back to the standard library when it is not installed.
+    """
+    backend = backend or OrjsonSerializer.name
+    if backend not in SERIALIZERS:
+        raise ValueError(f"Unknown serialization backend: '{backend}'")
+    if backend == OrjsonSerializer.name and orjson is None:
+        error_logger.warning("orjson is not installed; falling back to the json backend")
+        backend = JsonSerializer.name
+    return SERIALIZERS[backend]()
+
+
+def result_writer_source(backend: str = None) -> str:
+    """
+    Build the source of ``_write_result(result, path)`` for the sandbox
+    wrapper. It mirrors the parent's backend and uses the same encoders.
+    """
+    helpers = textwrap.indent(
+        inspect.getsource(scrub_non_finite) + "\n" + inspect.getsource(to_builtin),
+        "    "
+    )
+    use_orjson = (backend or OrjsonSerializer.name) == OrjsonSerializer.name
+    return f"""def _write_result(result, path):
+{helpers}
+    data = None
+    if {use_orjson}:
+        try:
+            import orjson
+            data = orjson.dumps(result, default=to_builtin)
+        except (ImportError, TypeError):
+            # No orjson in the jail, or a payload it rejects: use the json path
+            pass
+    if data is None:
+        import json
+        data = json.dumps(
+            scrub_non_finite(result),
+            default=to_builtin,
+            allow_nan=False,
+            ensure_ascii=False,
+            separators=(",", ":")
+        ).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
+"""
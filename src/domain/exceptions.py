@@ -5,4 +5,13 @@ class ExecutionError(Exception):
     """
     Raised when script execution fails or validation errors occur.
     """
-    pass
\ No newline at end of file
+    pass
+
+class ExecutionQueueFullError(Exception):
+    """
+    Raised when no sandbox slot frees up in time. The service is overloaded;
+    the script itself may be fine and the request can be retried.
+    """
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
@@ -17,4 +17,13 @@ class ExecutionResult:
     """
     def __init__(self, result: Any, stdout: str):
         self.result = result
+        self.stdout = stdout
+
+class RawExecutionResult:
+    """
+    Execution result whose payload is kept as the JSON bytes written by the
+    sandbox, so it can be forwarded without a decode/re-encode round trip.
+    """
+    def __init__(self, result_json: bytes, stdout: str):
+        self.result_json = result_json
         self.stdout = stdout
\ No newline at end of file
@@ -0,0 +1,252 @@
+import multiprocessing
+import os
+import signal
+import time
+import pytest
+from unittest.mock import MagicMock
+from domain.exceptions import ExecutionQueueFullError
+from adapters.executor.autoscaler import AdaptiveConcurrencyLimiter, HostPressureReader, SharedSlots
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePressure:
+    def __init__(self, cpu=0.0, memory=0.0):
+        self.values = {"cpu": cpu, "memory": memory}
+
+    def read(self):
+        return dict(self.values)
+
+
+def evaluate(limiter):
+    with limiter._condition:
+        return limiter._evaluate()
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def pressure():
+    return FakePressure()
+
+
+@pytest.fixture
+def limiter(clock, pressure):
+    return AdaptiveConcurrencyLimiter(
+        min_concurrency=1,
+        max_concurrency=4,
+        initial_concurrency=1,
+        target_queue_wait_ms=100,
+        evaluation_interval=1.0,
+        scale_up_step=2,
+        scale_down_step=1,
+        scale_down_after=3,
+        max_queue_wait=0,
+        pressure_reader=pressure,
+        clock=clock
+    )
+
+
+def test_invalid_bounds():
+    with pytest.raises(ValueError):
+        AdaptiveConcurrencyLimiter(min_concurrency=4, max_concurrency=2)
+
+
+def test_from_config_ignores_missing_keys():
+    limiter = AdaptiveConcurrencyLimiter.from_config({"max_concurrency": 3, "initial_concurrency": 2})
+    assert limiter.limit == 2
+    assert limiter.max_concurrency == 3
+
+
+def test_starts_at_max_concurrency():
+    assert AdaptiveConcurrencyLimiter(min_concurrency=1, max_concurrency=6).limit == 6
+
+
+def test_queue_full_raises(limiter):
+    limiter.acquire()
+    with pytest.raises(ExecutionQueueFullError) as exc_info:
+        limiter.acquire()
+    assert exc_info.value.retry_after == 1
+    assert limiter.waiting == 0
+
+
+def test_scale_up_on_queue_wait(limiter, clock):
+    limiter._waits = [0.5]
+    clock.now = 1.0
+    decision = evaluate(limiter)
+    assert decision["action"] == "scale_up"
+    assert limiter.limit == 3
+
+
+def test_scale_up_capped_at_max(limiter):
+    limiter.limit = 4
+    limiter._waits = [0.5]
+    evaluate(limiter)
+    assert limiter.limit == 4
+
+
+def test_scale_down_needs_sustained_pressure(limiter, pressure):
+    limiter.limit = 3
+    pressure.values["memory"] = 95.0
+    actions = [evaluate(limiter)["action"] for _ in range(3)]
+    assert actions == ["hold_pressure", "hold_pressure", "scale_down"]
+    assert limiter.limit == 2
+
+
+def test_pressure_streak_resets_when_it_clears(limiter, pressure):
+    limiter.limit = 3
+    pressure.values["cpu"] = 95.0
+    evaluate(limiter)
+    evaluate(limiter)
+    pressure.values["cpu"] = 0.0
+    evaluate(limiter)
+    pressure.values["cpu"] = 95.0
+    evaluate(limiter)
+    assert limiter.limit == 3
+
+
+def test_idle_never_scales_down(limiter, clock):
+    limiter.limit = 4
+    for second in range(1, 20):
+        clock.now = float(second)
+        with limiter._condition:
+            limiter._maybe_evaluate()
+    assert limiter.limit == 4
+
+
+def test_pressure_blocks_scale_up(limiter, pressure):
+    pressure.values["cpu"] = 95.0
+    limiter.limit = 2
+    limiter._waits = [0.5]
+    assert evaluate(limiter)["action"] == "hold_pressure"
+    assert limiter.limit == 2
+
+
+def test_snapshot_exposes_decisions(limiter):
+    evaluate(limiter)
+    snapshot = limiter.snapshot()
+    assert snapshot["limit"] == 1
+    assert snapshot["decisions"][-1]["action"] == "hold"
+
+
+def test_pressure_reader_prefers_psi(tmp_path):
+    (tmp_path / "pressure").mkdir()
+    (tmp_path / "pressure" / "cpu").write_text(
+        "some avg10=12.50 avg60=1.00 avg300=0.50 total=100\n"
+        "full avg10=0.00 avg60=0.00 avg300=0.00 total=0\n"
+    )
+    (tmp_path / "meminfo").write_text("MemTotal: 1000 kB\nMemAvailable: 250 kB\n")
+    assert HostPressureReader(str(tmp_path)).read() == {"cpu": 12.5, "memory": 75.0}
+
+
+def test_global_slots_are_acquired_and_released(limiter):
+    global_slots = MagicMock()
+    global_slots.acquire.return_value = True
+    limiter.global_slots = global_slots
+    with limiter.slot():
+        assert limiter.active == 1
+    global_slots.acquire.assert_called_once()
+    global_slots.release.assert_called_once()
+    assert limiter.active == 0
+
+
+def test_global_slots_exhausted_releases_local_slot(limiter):
+    global_slots = MagicMock()
+    global_slots.acquire.return_value = False
+    limiter.global_slots = global_slots
+    with pytest.raises(ExecutionQueueFullError):
+        with limiter.slot():
+            pass
+    global_slots.release.assert_not_called()
+    assert limiter.active == 0
+
+
+def test_shared_slots_reclaims_slots_of_dead_process():
+    context = multiprocessing.get_context("fork")
+    slots = SharedSlots(1, max_processes=4, context=context)
+    acquired = context.Event()
+
+    def hold_slot():
+        slots.acquire()
+        acquired.set()
+        time.sleep(60)
+
+    holder = context.Process(target=hold_slot)
+    holder.start()
+    try:
+        assert acquired.wait(10)
+        os.kill(holder.pid, signal.SIGKILL)
+        holder.join(10)
+        # The dead holder's slot is still counted until the master reclaims it
+        assert slots.acquire(timeout=0.1) is False
+        assert slots.reclaim(holder.pid) == 1
+        assert slots.acquire(timeout=0.1) is True
+        slots.release()
+        assert slots.in_use() == 0
+    finally:
+        if holder.is_alive():
+            holder.kill()
+
+
+def test_shared_slots_survive_a_killed_waiter():
+    context = multiprocessing.get_context("fork")
+    slots = SharedSlots(1, max_processes=4, context=context)
+    assert slots.acquire(timeout=0.1) is True
+    waiting = context.Event()
+
+    def wait_for_slot():
+        waiting.set()
+        slots.acquire(timeout=60)
+
+    waiter = context.Process(target=wait_for_slot)
+    waiter.start()
+    try:
+        assert waiting.wait(10)
+        time.sleep(0.1)
+        os.kill(waiter.pid, signal.SIGKILL)
+        waiter.join(10)
+        # Neither call may block on the dead waiter
+        assert slots.reclaim(waiter.pid) == 0
+        slots.release()
+        assert slots.acquire(timeout=1) is True
+        slots.release()
+        assert slots.in_use() == 0
+    finally:
+        if waiter.is_alive():
+            waiter.kill()
+
+
+def test_shared_cap_gets_only_the_remaining_queue_wait(limiter, clock):
+    limiter.max_queue_wait = 30
+    limiter.global_slots = MagicMock()
+    limiter.global_slots.acquire.return_value = True
+    limiter.active = 1
+
+    def wait(timeout=None):
+        # The local slot frees up after 20s of queueing
+        clock.now += 20
+        limiter.active = 0
+    limiter._condition.wait = wait
+
+    with limiter.slot():
+        pass
+    limiter.global_slots.acquire.assert_called_once_with(timeout=10)
+
+
+def test_shared_cap_tried_once_when_budget_is_spent(limiter):
+    global_slots = MagicMock()
+    global_slots.acquire.return_value = False
+    limiter.global_slots = global_slots
+    with pytest.raises(ExecutionQueueFullError):
+        with limiter.slot():
+            pass
+    global_slots.acquire.assert_called_once_with(timeout=0.0)
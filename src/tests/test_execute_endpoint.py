@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import patch
+from flask import Flask
+from adapters.http import execute
+from domain.exceptions import ExecutionQueueFullError
+from domain.models import RawExecutionResult
+
+SCRIPT = "def main():\n    return {'key': 'value'}"
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    app.register_blueprint(execute.bp, url_prefix="/api/v1")
+    with patch.object(execute, "ImportValidator"):
+        yield app.test_client()
+
+
+def test_execute_success(client):
+    result = RawExecutionResult(result_json=b'{"key":"value"}', stdout="out")
+    with patch.object(execute.executor, "execute", return_value=result):
+        response = client.post("/api/v1/execute", json={"script": SCRIPT})
+    assert response.status_code == 200
+    assert response.get_json() == {"result": {"key": "value"}, "stdout": "out"}
+
+
+def test_execute_queue_full_returns_503(client):
+    error = ExecutionQueueFullError("Execution queue is full. Please retry later.", retry_after=3)
+    with patch.object(execute.executor, "execute", side_effect=error):
+        response = client.post("/api/v1/execute", json={"script": SCRIPT})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "3"
+    assert "queue is full" in response.get_json()["error"]
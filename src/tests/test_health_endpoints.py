@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from flask import Flask
+from adapters.http import health
+from usecases.warmup import WarmupUseCase
+
+
+class DummyResult:
+    error = None
+
+
+class DummyExecutor:
+    def execute(self, script):
+        return DummyResult()
+
+
+class DummyValidator:
+    def validate(self, script): pass
+
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+@pytest.fixture
+def warmup():
+    return WarmupUseCase(
+        executor=DummyExecutor(),
+        validator=DummyValidator(),
+        logger=DummyLogger(),
+        config={"runs_per_canary": 2, "attempts": 1, "retry_interval": 0}
+    )
+
+
+@pytest.fixture
+def client(warmup):
+    app = Flask(__name__)
+    app.register_blueprint(health.bp, url_prefix="/api/v1/health")
+    with patch.object(health, "warmup", warmup):
+        yield app.test_client()
+
+
+def test_live(client):
+    response = client.get("/api/v1/health/live")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "alive"}
+
+
+def test_ready_is_503_until_warmup_succeeds(client, warmup):
+    response = client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.get_json() == {"ready": False, "live": True, "state": "pending"}
+
+    assert warmup.run() is True
+
+    response = client.get("/api/v1/health/ready")
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["ready"] is True
+    assert body["state"] == "ready"
+    assert body["cold_execution_ms"] >= 0
+    assert body["warm_execution_ms"] >= 0
+
+
+def test_failed_warmup_fails_liveness(client, warmup):
+    warmup.allowed_modules = ["non_existent_module"]
+    assert warmup.run(max_attempts=1) is False
+
+    assert client.get("/api/v1/health/ready").status_code == 503
+    response = client.get("/api/v1/health/live")
+    assert response.status_code == 503
+    assert response.get_json() == {"status": "unhealthy"}
+
+
+def test_live_fails_if_another_worker_gave_up(client, warmup):
+    warmup.shared = MagicMock()
+    warmup.shared.summary.return_value = {"ready": False, "live": False, "workers": 2, "ready_workers": 1}
+    assert warmup.run() is True
+
+    assert client.get("/api/v1/health/live").status_code == 503
+    response = client.get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["ready_workers"] == 1
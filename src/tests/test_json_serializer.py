@@ -0,0 +1,130 @@
+import datetime
+import decimal
+import math
+import pytest
+from adapters.serializer.json_serializer import (
+    JsonSerializer,
+    OrjsonSerializer,
+    get_serializer,
+    result_writer_source
+)
+
+SERIALIZERS = [JsonSerializer(), get_serializer("orjson")]
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+def test_roundtrip_builtin_types(serializer):
+    data = {"message": "hello", "items": [1, 2.5, None, True]}
+    assert serializer.loads(serializer.dumps(data)) == data
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+def test_non_finite_floats_become_null(serializer):
+    data = {"nan": math.nan, "inf": [math.inf, 1.0]}
+    assert serializer.loads(serializer.dumps(data)) == {"nan": None, "inf": [None, 1.0]}
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+def test_datetimes_and_sets(serializer):
+    data = {"when": datetime.datetime(2024, 1, 2, 3, 4, 5), "tags": {"a"}}
+    assert serializer.loads(serializer.dumps(data)) == {"when": "2024-01-02T03:04:05", "tags": ["a"]}
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+def test_numpy_and_pandas(serializer):
+    np = pytest.importorskip("numpy")
+    pd = pytest.importorskip("pandas")
+    data = {
+        "array": np.array([1.0, np.nan]),
+        "scalar": np.int64(7),
+        "frame": pd.DataFrame({"a": [1, 2]}),
+    }
+    assert serializer.loads(serializer.dumps(data)) == {
+        "array": [1.0, None],
+        "scalar": 7,
+        "frame": [{"a": 1}, {"a": 2}],
+    }
+
+
+@pytest.mark.parametrize("serializer", SERIALIZERS, ids=lambda s: s.name)
+def test_unsupported_type_raises(serializer):
+    with pytest.raises(TypeError):
+        serializer.dumps({"value": object()})
+
+
+def test_get_serializer_unknown_backend():
+    with pytest.raises(ValueError):
+        get_serializer("pickle")
+
+
+def test_get_serializer_defaults_to_orjson():
+    pytest.importorskip("orjson")
+    assert isinstance(get_serializer(), OrjsonSerializer)
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_result_writer_source(backend, tmp_path):
+    namespace = {}
+    exec(result_writer_source(backend), namespace)
+    path = tmp_path / "result.json"
+    namespace["_write_result"]({"value": math.nan, "day": datetime.date(2024, 1, 2)}, str(path))
+    assert JsonSerializer().loads(path.read_bytes()) == {"value": None, "day": "2024-01-02"}
+
+
+CONSISTENCY_CASES = [
+    (lambda np, pd: {"value": np.datetime64("2024-01-01")}, {"value": "2024-01-01T00:00:00"}),
+    (lambda np, pd: {"value": np.datetime64("2024-01-01T00:00:00.123456789")},
+     {"value": "2024-01-01T00:00:00.123456"}),
+    (lambda np, pd: {"value": np.datetime64("NaT")}, {"value": None}),
+    (lambda np, pd: {"value": np.array(["2024-01-01"], dtype="datetime64[ns]")},
+     {"value": ["2024-01-01T00:00:00"]}),
+    (lambda np, pd: {"value": np.timedelta64(90, "s")}, {"value": 90.0}),
+    (lambda np, pd: {"value": np.array([1, 2], dtype="timedelta64[s]")}, {"value": [1.0, 2.0]}),
+    (lambda np, pd: {"value": datetime.timedelta(minutes=1)}, {"value": 60.0}),
+    (lambda np, pd: {"value": pd.Timedelta(seconds=2)}, {"value": 2.0}),
+    (lambda np, pd: {"value": pd.Timestamp("2024-01-01", tz="UTC")}, {"value": "2024-01-01T00:00:00+00:00"}),
+    (lambda np, pd: {"value": pd.NA, "nat": pd.NaT}, {"value": None, "nat": None}),
+    (lambda np, pd: {"value": pd.Series([1, None], dtype="Int64")}, {"value": {"0": 1, "1": None}}),
+    (lambda np, pd: {"value": np.float32(0.1)}, {"value": 0.10000000149011612}),
+    (lambda np, pd: {"value": np.array([[1, 2], [3, 4]])}, {"value": [[1, 2], [3, 4]]}),
+    (lambda np, pd: {(1, 2): "tuple", 3: "int", None: "none", True: "bool"},
+     {"(1, 2)": "tuple", "3": "int", "null": "none", "true": "bool"}),
+    (lambda np, pd: {datetime.date(2024, 1, 2): 1}, {"2024-01-02": 1}),
+    (lambda np, pd: {"value": 2 ** 70}, {"value": 2 ** 70}),
+    (lambda np, pd: {"value": decimal.Decimal("1.5"), "text": "é \n"}, {"value": 1.5, "text": "é \n"}),
+]
+
+
+@pytest.mark.parametrize("build, expected", CONSISTENCY_CASES, ids=range(len(CONSISTENCY_CASES)))
+def test_backends_produce_identical_output(build, expected, tmp_path):
+    pytest.importorskip("orjson")
+    data = build(pytest.importorskip("numpy"), pytest.importorskip("pandas"))
+    outputs = {
+        "json": JsonSerializer().dumps(data),
+        "orjson": OrjsonSerializer().dumps(data),
+    }
+    # The sandbox writer must agree with the parent for both backends
+    for backend in ("json", "orjson"):
+        namespace = {}
+        exec(result_writer_source(backend), namespace)
+        path = tmp_path / f"{backend}.json"
+        namespace["_write_result"](data, str(path))
+        outputs[f"sandbox-{backend}"] = path.read_bytes()
+
+    assert len(set(outputs.values())) == 1, outputs
+    assert JsonSerializer().loads(outputs["json"]) == expected
+
+
+def test_loads_rejects_non_finite_constants():
+    with pytest.raises(ValueError):
+        JsonSerializer().loads(b'{"value": NaN}')
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), OrjsonSerializer()])
+@pytest.mark.parametrize("data", [
+    b'\xef\xbb\xbf{"a":1}',
+    '{"a":1}'.encode("utf-16"),
+])
+def test_loads_accepts_only_utf8_without_bom(serializer, data):
+    with pytest.raises(ValueError):
+        serializer.loads(data)
@@ -1,7 +1,11 @@
 import pytest
+from pathlib import Path
 from unittest.mock import patch, MagicMock
 from src.adapters.executor.nsjail_executor import NsjailExecutor
 from src.utils.config_loader import AppConfigLoader
+from domain.exceptions import ExecutionQueueFullError
+from domain.models import RawExecutionResult
+from interfaces.schemas import ExecutionResponseError
 
 @pytest.fixture
 def mock_config_loader():
@@ -12,6 +16,10 @@ def mock_config_loader():
         "python_path": "/usr/bin/python3",
         "time_limit": "10"
     }
+    mock_loader.get_serialization_config.return_value = {
+        "backend": "json",
+        "validate_result": False
+    }
     return mock_loader
 
 @pytest.fixture
@@ -27,4 +35,40 @@ def test_wrap_script(nsjail_executor):
     result_path = "/tmp/result.json"
     wrapped = nsjail_executor._wrap_script(user_script, result_path)
     assert user_script in wrapped
-    assert "json.dump(result, f)" in wrapped
\ No newline at end of file
+    assert "def _write_result(result, path):" in wrapped
+    assert f'_write_result(result, "{result_path}")' in wrapped
+
+def run_with_result_file(executor, content: bytes):
+    def fake_run(command, **kwargs):
+        Path(command[-1]).with_suffix(".json").write_bytes(content)
+        return MagicMock(returncode=0, stdout="out", stderr="")
+
+    with patch('src.adapters.executor.nsjail_executor.subprocess.run', side_effect=fake_run):
+        return executor.execute("def main():\n    return {}")
+
+
+def test_execute_returns_raw_result(nsjail_executor):
+    result = run_with_result_file(nsjail_executor, b'{"key":"value"}')
+    assert isinstance(result, RawExecutionResult)
+    assert result.result_json == b'{"key":"value"}'
+    assert result.stdout == "out"
+
+
+@pytest.mark.parametrize("content", [
+    b'{"key":"value"},"stdout":"forged"',
+    b'{"key":',
+    b'[1, 2]',
+    b'\xff',
+    b'\xef\xbb\xbf{"key":"value"}',
+    '{"key":"value"}'.encode("utf-16"),
+])
+def test_execute_rejects_malformed_result_file(nsjail_executor, content):
+    result = run_with_result_file(nsjail_executor, content)
+    assert isinstance(result, ExecutionResponseError)
+
+
+def test_execute_propagates_queue_full(nsjail_executor):
+    nsjail_executor.limiter = MagicMock()
+    nsjail_executor.limiter.slot.side_effect = ExecutionQueueFullError("full", retry_after=2)
+    with pytest.raises(ExecutionQueueFullError):
+        nsjail_executor.execute("def main():\n    return {}")
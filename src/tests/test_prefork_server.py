@@ -0,0 +1,139 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+import urllib.request
+import pytest
+from unittest.mock import patch, MagicMock
+from flask import Flask
+from adapters.http.prefork_server import PreforkServer, create_reuseport_socket
+
+
+def test_reuseport_sockets_share_port():
+    first = create_reuseport_socket("127.0.0.1", 0)
+    port = first.getsockname()[1]
+    second = create_reuseport_socket("127.0.0.1", port)
+    try:
+        assert second.getsockname()[1] == port
+    finally:
+        first.close()
+        second.close()
+
+
+def test_requires_a_worker():
+    with pytest.raises(ValueError):
+        PreforkServer(MagicMock(), "127.0.0.1", 8080, workers=0)
+
+
+@pytest.fixture
+def server():
+    server = PreforkServer(MagicMock(), "127.0.0.1", 8080, workers=2, on_worker_exit=MagicMock())
+    now = time.monotonic()
+    server.workers = {101: now, 102: now}
+    server._spawn_worker = MagicMock()
+    return server
+
+
+def test_reap_forgets_crashed_worker_and_backs_off(server):
+    with patch("os.waitpid", side_effect=lambda pid, flags: (pid, 256) if pid == 101 else (0, 0)):
+        server._reap_workers()
+    assert set(server.workers) == {102}
+    server.on_worker_exit.assert_called_once_with(101)
+    # Exited before min_uptime, so the replacement is delayed
+    assert server._spawn_failures == 1
+    assert server._next_spawn_at > time.monotonic()
+    server._spawn_worker.assert_not_called()
+
+
+def test_reap_expected_exit_is_not_a_failure(server):
+    with patch("os.waitpid", side_effect=lambda pid, flags: (pid, 0) if pid == 101 else (0, 0)):
+        server._reap_workers(expected=[101])
+    assert set(server.workers) == {102}
+    assert server._spawn_failures == 0
+
+
+def test_failed_spawns_back_off_exponentially(server):
+    server.workers = {}
+    server._spawn_worker.side_effect = lambda: server._record_failure()
+    delays = []
+    for _ in range(4):
+        server._next_spawn_at = 0.0
+        server._maintain_workers()
+        delays.append(round(server._next_spawn_at - time.monotonic()))
+    assert server._spawn_worker.call_count == 4
+    assert delays == [0, 1, 2, 4]
+    # Still backing off: no spawn until the delay has passed
+    server._maintain_workers()
+    assert server._spawn_worker.call_count == 4
+
+
+def test_rolling_restart_replaces_each_worker(server):
+    server._stop_workers = MagicMock()
+    server._spawn_worker.return_value = 200
+    server._rolling_restart()
+    assert server._spawn_worker.call_count == 2
+    stopped = {call.args[0][0] for call in server._stop_workers.call_args_list}
+    assert stopped == {101, 102}
+
+
+def test_rolling_restart_keeps_workers_if_replacement_fails(server):
+    server._stop_workers = MagicMock()
+    server._spawn_worker.return_value = None
+    server._rolling_restart()
+    server._stop_workers.assert_not_called()
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _get(port: int, timeout: float = 10) -> bytes:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=2) as response:
+                return response.read()
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def test_serves_requests_and_shuts_down():
+    app = Flask(__name__)
+    app.add_url_rule("/", "pid", lambda: str(os.getpid()))
+    port = _free_port()
+    server = PreforkServer(app, "127.0.0.1", port, workers=2, graceful_timeout=5)
+    process = multiprocessing.get_context("fork").Process(target=server.serve)
+    process.start()
+    try:
+        worker_pid = int(_get(port))
+        assert worker_pid != process.pid
+    finally:
+        os.kill(process.pid, signal.SIGTERM)
+        process.join(10)
+    assert process.exitcode == 0
+    with pytest.raises(ProcessLookupError):
+        os.kill(worker_pid, 0)
+
+
+def test_port_in_use_aborts_without_forking():
+    with socket.socket() as blocker:
+        blocker.bind(("127.0.0.1", 0))
+        blocker.listen()
+        server = PreforkServer(Flask(__name__), "127.0.0.1", blocker.getsockname()[1], workers=2)
+        with patch("os.fork") as fork, pytest.raises(OSError):
+            server.serve()
+    fork.assert_not_called()
+
+
+def test_worker_that_never_becomes_ready_aborts_serve():
+    server = PreforkServer(Flask(__name__), "127.0.0.1", 0, workers=2, ready_timeout=5)
+    with patch("adapters.http.prefork_server.make_server", side_effect=OSError("boom")), \
+            patch("os.fork", wraps=os.fork) as fork, pytest.raises(RuntimeError):
+        server.serve()
+    assert fork.call_count == 1
+    assert server.workers == {}
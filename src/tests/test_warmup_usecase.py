@@ -0,0 +1,154 @@
+import multiprocessing
+import pytest
+from unittest.mock import patch
+from usecases.warmup import SharedReadiness, WarmupUseCase
+
+
+class DummyResult:
+    def __init__(self, error=None):
+        self.error = error
+
+
+class DummyExecutor:
+    def __init__(self, error=None):
+        self.error = error
+        self.calls = 0
+
+    def execute(self, script):
+        self.calls += 1
+        return DummyResult(self.error)
+
+
+class DummyValidator:
+    def __init__(self):
+        self.scripts = []
+
+    def validate(self, script):
+        self.scripts.append(script)
+
+
+class DummyLogger:
+    def info(self, msg): pass
+    def error(self, msg): pass
+
+
+def make_usecase(executor, config=None, allowed_modules=None):
+    return WarmupUseCase(
+        executor=executor,
+        validator=DummyValidator(),
+        logger=DummyLogger(),
+        allowed_modules=allowed_modules or ["math"],
+        config={"retry_interval": 0, **(config or {})}
+    )
+
+
+def test_warmup_success_reports_latencies():
+    executor = DummyExecutor()
+    usecase = make_usecase(executor, {"canaries": ["a", "b"], "runs_per_canary": 2})
+
+    assert usecase.run() is True
+    status = usecase.snapshot()
+    assert status["ready"] is True
+    assert status["state"] == "ready"
+    assert status["canary_runs"] == 4
+    assert status["cold_execution_ms"] is not None
+    assert status["warm_execution_ms"] is not None
+    assert executor.calls == 4
+
+
+def test_not_ready_before_run():
+    usecase = make_usecase(DummyExecutor())
+    assert usecase.snapshot() == {"ready": False, "live": True, "state": "pending"}
+
+
+def test_failed_canary_is_retried_then_not_live():
+    executor = DummyExecutor(error="boom")
+    usecase = make_usecase(executor, {"attempts": 2, "runs_per_canary": 1})
+
+    assert usecase.run(max_attempts=1) is False
+    assert usecase.live is True
+    assert usecase.run(max_attempts=2) is False
+    status = usecase.snapshot()
+    assert status["ready"] is False
+    assert status["live"] is False
+    assert status["state"] == "failed"
+    assert status["attempt"] == 2
+    assert "boom" in status["error"]
+    assert executor.calls == 3
+
+
+def test_retry_backs_off_exponentially():
+    usecase = make_usecase(DummyExecutor(error="boom"), {
+        "runs_per_canary": 1, "retry_interval": 1, "max_retry_interval": 3
+    })
+    with patch("usecases.warmup.time.sleep") as sleep:
+        assert usecase.run(max_attempts=4) is False
+    assert [call.args[0] for call in sleep.call_args_list] == [1, 2, 3]
+    assert usecase.snapshot()["retry_in"] == 3
+
+
+def test_recovers_after_failures():
+    executor = DummyExecutor(error="boom")
+    usecase = make_usecase(executor, {"attempts": 1, "runs_per_canary": 1})
+    usecase.run(max_attempts=1)
+    assert usecase.live is False
+
+    executor.error = None
+    assert usecase.run() is True
+    assert usecase.snapshot()["live"] is True
+    assert usecase.snapshot()["ready"] is True
+
+
+def test_missing_allowed_module_fails_warmup():
+    usecase = make_usecase(DummyExecutor(), {"attempts": 1}, allowed_modules=["non_existent_module"])
+    assert usecase.run(max_attempts=1) is False
+    assert usecase.snapshot()["state"] == "failed"
+
+
+def test_disabled_warmup_is_ready():
+    executor = DummyExecutor()
+    usecase = make_usecase(executor, {"enabled": False})
+    assert usecase.run() is True
+    assert usecase.snapshot()["state"] == "disabled"
+    assert executor.calls == 0
+
+
+def test_shared_readiness_waits_for_every_worker():
+    readiness = SharedReadiness(2, max_processes=4)
+    usecase = make_usecase(DummyExecutor())
+    usecase.shared = readiness
+    assert usecase.run() is True
+    # Only this process has warmed up; the second worker is missing
+    assert usecase.snapshot()["ready"] is False
+
+    context = multiprocessing.get_context("fork")
+    worker = context.Process(target=lambda: readiness.update(ready=True, live=True))
+    worker.start()
+    worker.join(10)
+    status = usecase.snapshot()
+    assert status["ready"] is True
+    assert status["ready_workers"] == 2
+
+    # A replacement worker is registered but still warming
+    readiness.clear(worker.pid)
+    worker = context.Process(target=lambda: readiness.update(ready=False, live=True))
+    worker.start()
+    worker.join(10)
+    assert usecase.snapshot()["ready"] is False
+    assert usecase.snapshot()["live"] is True
+
+
+def test_shared_readiness_not_live_if_any_worker_gave_up():
+    readiness = SharedReadiness(2, max_processes=4)
+    usecase = make_usecase(DummyExecutor())
+    usecase.shared = readiness
+    assert usecase.run() is True
+
+    context = multiprocessing.get_context("fork")
+    worker = context.Process(target=lambda: readiness.update(ready=False, live=False))
+    worker.start()
+    worker.join(10)
+    assert usecase.live is True
+    assert usecase.snapshot()["live"] is False
+    readiness.clear(worker.pid)
+    assert usecase.snapshot()["live"] is True
@@ -0,0 +1,184 @@
+"""
+Use case: warm the service up at startup and track its readiness.
+"""
+import importlib
+import multiprocessing
+import os
+import statistics
+import threading
+import time
+
+from domain.exceptions import ExecutionError
+
+DEFAULT_CANARY = """
+def main():
+    return {"status": "ok"}
+"""
+
+
+class SharedReadiness:
+    """
+    Warm-up state of every prefork worker, kept in shared memory so any
+    worker answering a health check reports on the whole instance.
+    The instance is ready only when the expected number of workers are
+    registered and all of them are warm; it is not live if any worker has
+    given up. Must be created in the master before the workers are forked.
+    """
+    PENDING, READY, FAILED = 0, 1, 2
+
+    def __init__(self, workers: int, max_processes: int = 64, context=None):
+        context = context or multiprocessing.get_context("fork")
+        self.workers = workers
+        self._lock = context.Lock()
+        self._pids = context.Array("i", max_processes, lock=False)
+        self._states = context.Array("i", max_processes, lock=False)
+
+    def update(self, ready: bool, live: bool):
+        """Record the calling process's warm-up state."""
+        state = self.READY if ready else self.PENDING if live else self.FAILED
+        pid = os.getpid()
+        with self._lock:
+            rows = [row for row, owner in enumerate(self._pids) if owner == pid]
+            rows = rows or [row for row, owner in enumerate(self._pids) if owner == 0]
+            if not rows:
+                raise RuntimeError("No free readiness rows; raise max_processes")
+            self._pids[rows[0]] = pid
+            self._states[rows[0]] = state
+
+    def clear(self, pid: int):
+        """Forget a worker that exited."""
+        with self._lock:
+            for row, owner in enumerate(self._pids):
+                if owner == pid:
+                    self._pids[row] = 0
+                    self._states[row] = self.PENDING
+
+    def summary(self) -> dict:
+        with self._lock:
+            states = [state for pid, state in zip(self._pids, self._states) if pid]
+        ready_workers = states.count(self.READY)
+        return {
+            "ready": len(states) >= self.workers and ready_workers == len(states),
+            "live": self.FAILED not in states,
+            "workers": self.workers,
+            "ready_workers": ready_workers
+        }
+
+
+class WarmupUseCase:
+    """
+    Preloads the allowed modules, then runs canary scripts through the
+    validator and executor so binaries and libraries are paged in before
+    traffic arrives. The service is ready only once a warm-up succeeds.
+    Failed warm-ups are retried with exponential backoff; after ``attempts``
+    consecutive failures the instance also reports itself as not live so
+    the orchestrator replaces it.
+    When ``shared`` is set (prefork mode) every worker publishes its state
+    there and ``snapshot`` reports on the whole instance.
+    """
+    def __init__(self, executor, validator, logger, allowed_modules=None, config=None):
+        config = config or {}
+        self.enabled = bool(config.get("enabled", True))
+        self.executor = executor
+        self.validator = validator
+        self.logger = logger
+        self.allowed_modules = allowed_modules or []
+        self.canaries = config.get("canaries") or [DEFAULT_CANARY]
+        self.runs_per_canary = max(1, int(config.get("runs_per_canary", 3)))
+        self.attempts = max(1, int(config.get("attempts", 3)))
+        self.retry_interval = float(config.get("retry_interval", 5))
+        self.max_retry_interval = float(config.get("max_retry_interval", 60))
+
+        self.live = True
+        self.ready = False
+        self.status = {"state": "pending"}
+        # Optional SharedReadiness set before prefork workers are forked
+        self.shared = None
+        self._lock = threading.Lock()
+
+    def start(self) -> threading.Thread:
+        """Run the warm-up in a background thread."""
+        thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self, max_attempts: int = None) -> bool:
+        """
+        Warm up, retrying until it succeeds (or ``max_attempts`` is reached).
+        """
+        if not self.enabled:
+            self._set_status(True, {"state": "disabled"})
+            return True
+        attempt = 0
+        while max_attempts is None or attempt < max_attempts:
+            attempt += 1
+            self._set_status(False, {"state": "warming", "attempt": attempt})
+            try:
+                status = self._warm()
+            except Exception as e:
+                delay = min(self.max_retry_interval, self.retry_interval * 2 ** (attempt - 1))
+                self.logger.error(f"Warm-up attempt {attempt} failed: {e}; retrying in {delay:.1f}s")
+                if attempt >= self.attempts and self.live:
+                    self.logger.error(f"Warm-up failed {attempt} times; reporting not live")
+                    self.live = False
+                self._set_status(False, {
+                    "state": "failed", "attempt": attempt, "error": str(e), "retry_in": delay
+                })
+                if max_attempts is None or attempt < max_attempts:
+                    time.sleep(delay)
+                continue
+            status.update(state="ready", attempt=attempt)
+            self.live = True
+            self._set_status(True, status)
+            self.logger.info(f"Warm-up complete: {status}")
+            return True
+        return False
+
+    def preload(self) -> float:
+        """Import the allowed modules; returns the time taken in ms."""
+        started = time.perf_counter()
+        for module_name in self.allowed_modules:
+            importlib.import_module(module_name)
+        return (time.perf_counter() - started) * 1000
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            snapshot = {"ready": self.ready, "live": self.live, **self.status}
+        if self.shared is not None:
+            snapshot.update(self.shared.summary())
+        return snapshot
+
+    def _set_status(self, ready: bool, status: dict):
+        with self._lock:
+            self.ready = ready
+            self.status = status
+        if self.shared is not None:
+            self.shared.update(ready, self.live)
+
+    def _warm(self) -> dict:
+        preload_ms = self.preload()
+
+        # The first run of each canary counts as cold, later runs as warm
+        cold_ms = []
+        warm_ms = []
+        for canary in self.canaries:
+            for run in range(self.runs_per_canary):
+                elapsed_ms = self._run_canary(canary)
+                (warm_ms if run else cold_ms).append(elapsed_ms)
+
+        return {
+            "preload_ms": round(preload_ms, 3),
+            "cold_execution_ms": round(statistics.median(cold_ms), 3),
+            "warm_execution_ms": round(statistics.median(warm_ms), 3) if warm_ms else None,
+            "canary_runs": len(self.canaries) * self.runs_per_canary
+        }
+
+    def _run_canary(self, script: str) -> float:
+        started = time.perf_counter()
+        self.validator.validate(script)
+        result = self.executor.execute(script)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        # The executor reports failures as a response object with an error
+        if getattr(result, "error", None):
+            raise ExecutionError(f"Canary script failed: {result.error}")
+        return elapsed_ms
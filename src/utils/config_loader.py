@@ -30,9 +30,18 @@ class AppConfigLoader:
     def get_flask_config(self):
         return self.config.get("app", {}).get("flask", {})
     
+    def get_server_config(self):
+        return self.config.get("app", {}).get("server", {})
+
     def get_nsjail_config(self):
         return self.config.get("nsjail", {})
 
+    def get_serialization_config(self):
+        return self.config.get("serialization", {})
+
+    def get_warmup_config(self):
+        return self.config.get("warmup", {})
+
     def get_allowed_commands(self):
         return self.config.get("app", {}).get("allowed_commands", [])
 